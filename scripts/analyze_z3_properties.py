@@ -23,17 +23,28 @@ Usage:
 Returns: Exit code 0 if compliant, non-zero if violations found
 """
 
+import mmap
 import sys
 import struct
 
+# Header fields we need: version byte at 0x00, object table address at 0x0A
+_HEADER = struct.Struct('>B9xH')
+_U16 = struct.Struct('>H').unpack_from
+
+# Only the first violations are listed in detail; the rest are just counted
+_MAX_LISTED_VIOLATIONS = 100
+
 class Z3PropertyAnalyzer:
+    __slots__ = ('data', 'version', 'object_table_addr')
+
     def __init__(self, filename):
+        # Map the file read-only; only the header, object table and property
+        # tables are touched, so let the page cache serve them on demand
         with open(filename, 'rb') as f:
-            self.data = f.read()
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
         # Parse Z-Machine header
-        self.version = self.data[0]
-        self.object_table_addr = struct.unpack('>H', self.data[0x0A:0x0C])[0]
+        self.version, self.object_table_addr = _HEADER.unpack_from(self.data, 0)
 
         print(f"Z-Machine Version: {self.version}")
         print(f"Object Table Address: 0x{self.object_table_addr:04x}")
@@ -42,8 +53,15 @@ class Z3PropertyAnalyzer:
             print(f"WARNING: This analyzer is designed for V3 games, got V{self.version}")
 
     def analyze_properties(self):
-        """Analyze all object properties for V3 compliance"""
-        violations = []
+        """Analyze all object properties for V3 compliance
+
+        Yields (object, property, size, size_byte, address) for each violation.
+        """
+        out = []
+
+        # Bind hot attributes to locals for the object walk
+        data = self.data
+        dlen = len(data)
 
         # Skip property defaults table (31 words = 62 bytes for V3)
         obj_entries_start = self.object_table_addr + 62
@@ -52,112 +70,127 @@ class Z3PropertyAnalyzer:
         obj_num = 1
         addr = obj_entries_start
 
-        print(f"\n=== OBJECT PROPERTY ANALYSIS ===")
+        out.append("\n=== OBJECT PROPERTY ANALYSIS ===\n")
 
-        while addr < len(self.data) - 9:
-            # Read object entry (9 bytes for V3)
-            # Bytes 0-3: attributes (32 bits)
-            # Bytes 4-6: parent, sibling, child
-            # Bytes 7-8: property table address (word)
+        try:
+            while addr < dlen - 9:
+                # Read object entry (9 bytes for V3)
+                # Bytes 0-3: attributes (32 bits)
+                # Bytes 4-6: parent, sibling, child
+                # Bytes 7-8: property table address (word)
 
-            if addr + 9 > len(self.data):
-                break
+                if addr + 9 > dlen:
+                    break
 
-            prop_table_addr = struct.unpack('>H', self.data[addr + 7:addr + 9])[0]
+                prop_table_addr = _U16(data, addr + 7)[0]
 
-            if prop_table_addr == 0:
-                break  # End of objects
+                if prop_table_addr == 0:
+                    break  # End of objects
 
-            print(f"\nObject #{obj_num} - Property table at 0x{prop_table_addr:04x}")
+                out.append(f"\nObject #{obj_num} - Property table at 0x{prop_table_addr:04x}\n")
 
-            # Analyze this object's properties
-            violations.extend(self.analyze_object_properties(obj_num, prop_table_addr))
+                # Analyze this object's properties
+                yield from self.analyze_object_properties(obj_num, prop_table_addr, out)
 
-            obj_num += 1
-            addr += 9
+                # Flush this object's report so only one object is buffered at a time
+                sys.stdout.write(''.join(out))
+                out.clear()
 
-            # Safety check - don't analyze more than 100 objects
-            if obj_num > 100:
-                print("Reached safety limit of 100 objects")
-                break
+                obj_num += 1
+                addr += 9
 
-        return violations
+                # Safety check - don't analyze more than 100 objects
+                if obj_num > 100:
+                    out.append("Reached safety limit of 100 objects\n")
+                    break
+        finally:
+            # Write whatever is still buffered, even if the caller stops early
+            sys.stdout.write(''.join(out))
 
-    def analyze_object_properties(self, obj_num, prop_table_addr):
-        """Analyze properties for a single object"""
-        violations = []
+    def analyze_object_properties(self, obj_num, prop_table_addr, out):
+        """Analyze properties for a single object, appending report lines to out
 
-        if prop_table_addr >= len(self.data):
-            print(f"  ERROR: Property table address out of bounds")
-            return violations
+        Yields (object, property, size, size_byte, address) for each violation.
+        """
+
+        # Bind hot attributes to locals for the property walk
+        data = self.data
+        dlen = len(data)
+
+        if prop_table_addr >= dlen:
+            out.append("  ERROR: Property table address out of bounds\n")
+            return
 
         # Skip object name (first byte is length in words)
-        name_len_words = self.data[prop_table_addr]
+        name_len_words = data[prop_table_addr]
         name_bytes = name_len_words * 2
         prop_start = prop_table_addr + 1 + name_bytes
 
-        print(f"  Name length: {name_len_words} words ({name_bytes} bytes)")
-        print(f"  Properties start at: 0x{prop_start:04x}")
+        out.append(f"  Name length: {name_len_words} words ({name_bytes} bytes)\n")
+        out.append(f"  Properties start at: 0x{prop_start:04x}\n")
 
         # Parse properties
         addr = prop_start
         prop_count = 0
 
-        while addr < len(self.data) and prop_count < 50:  # Safety limit
-            size_byte = self.data[addr]
+        while addr < dlen and prop_count < 50:  # Safety limit
+            size_byte = data[addr]
 
             if size_byte == 0:
-                print(f"  Property list terminator found")
+                out.append("  Property list terminator found\n")
                 break
 
             # V3 property format: top 3 bits = size-1, bottom 5 bits = prop number
             prop_num = size_byte & 0x1F
             prop_size = ((size_byte >> 5) & 0x07) + 1
 
-            print(f"  Property #{prop_num}: size_byte=0x{size_byte:02x}, size={prop_size} bytes")
+            out.append(f"  Property #{prop_num}: size_byte=0x{size_byte:02x}, size={prop_size} bytes\n")
 
             # Check for V3 compliance
             if prop_size > 8:
-                violation = {
-                    'object': obj_num,
-                    'property': prop_num,
-                    'size': prop_size,
-                    'size_byte': size_byte,
-                    'address': addr
-                }
-                violations.append(violation)
-                print(f"    ⚠️  VIOLATION: Property size {prop_size} exceeds V3 maximum of 8 bytes!")
+                out.append(f"    ⚠️  VIOLATION: Property size {prop_size} exceeds V3 maximum of 8 bytes!\n")
+                yield (obj_num, prop_num, prop_size, size_byte, addr)
 
             # Check for impossible sizes (would indicate two-byte format confusion)
             if prop_size == 0:
-                print(f"    ⚠️  WARNING: Property size 0 (this shouldn't happen in V3)")
+                out.append("    ⚠️  WARNING: Property size 0 (this shouldn't happen in V3)\n")
 
             addr += 1 + prop_size  # Skip size byte + property data
             prop_count += 1
 
-        return violations
-
     def print_violations_summary(self, violations):
-        """Print summary of all violations found"""
+        """Print summary of all violations found, returning the violation count"""
+        # Stream the violations, keeping only the listed ones as text
+        listed = []
+        count = 0
+
+        for obj_num, prop_num, prop_size, size_byte, addr in violations:
+            count += 1
+            if count <= _MAX_LISTED_VIOLATIONS:
+                listed.append(f"  Object #{obj_num}, Property #{prop_num}:\n")
+                listed.append(f"    Size: {prop_size} bytes (max allowed: 8)\n")
+                listed.append(f"    Size byte: 0x{size_byte:02x} at address 0x{addr:04x}\n")
+
         print(f"\n=== VIOLATIONS SUMMARY ===")
 
-        if not violations:
+        if not count:
             print("✅ No V3 property size violations found!")
             print("All properties comply with V3 single-byte format (max 8 bytes)")
-            return
+            return count
 
-        print(f"❌ Found {len(violations)} property size violations:")
+        print(f"❌ Found {count} property size violations:")
+        sys.stdout.write(''.join(listed))
 
-        for v in violations:
-            print(f"  Object #{v['object']}, Property #{v['property']}:")
-            print(f"    Size: {v['size']} bytes (max allowed: 8)")
-            print(f"    Size byte: 0x{v['size_byte']:02x} at address 0x{v['address']:04x}")
+        if count > _MAX_LISTED_VIOLATIONS:
+            print(f"  ... and {count - _MAX_LISTED_VIOLATIONS} more")
 
         print(f"\n🚨 CONCLUSION:")
         print(f"The Grue compiler is generating properties that violate V3 specification!")
         print(f"This explains why the interpreter needed incorrect 'two-byte format' support.")
         print(f"FIX: Update the compiler to respect V3's 8-byte property limit.")
 
+        return count
+
 def main():
     if len(sys.argv) != 2:
         print("Usage: python3 analyze_z3_properties.py <z3_file>")
@@ -169,10 +202,11 @@ def main():
     try:
         analyzer = Z3PropertyAnalyzer(filename)
         violations = analyzer.analyze_properties()
-        analyzer.print_violations_summary(violations)
+        count = analyzer.print_violations_summary(violations)
 
-        # Exit code indicates whether violations were found
-        sys.exit(len(violations))
+        # Exit code indicates whether violations were found; cap it so a
+        # count that is a multiple of 256 can't wrap around to 0
+        sys.exit(min(count, 255))
 
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found")
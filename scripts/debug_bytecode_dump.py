@@ -1,17 +1,32 @@
 #!/usr/bin/env python3
 
+import os
 import sys
 
+# Maps every byte to itself if printable ASCII, otherwise to '.'
+_PRINTABLE = bytes(b if 32 <= b <= 126 else ord('.') for b in range(256))
+
+# Classic hexdump row width
+_ROW = 16
+
 def dump_bytecode(filename, start_addr, end_addr):
+    # Only the requested range is needed, so read just that window,
+    # clamped to the file size so an oversized end address dumps to EOF
     with open(filename, 'rb') as f:
-        data = f.read()
+        size = os.fstat(f.fileno()).st_size
+        f.seek(start_addr)
+        data = f.read(max(0, min(end_addr + 1, size) - start_addr))
+
+    out = [f"Dumping bytecode from {filename} at addresses 0x{start_addr:04x} to 0x{end_addr:04x}\n\n"]
 
-    print(f"Dumping bytecode from {filename} at addresses 0x{start_addr:04x} to 0x{end_addr:04x}")
-    print()
+    for offset in range(0, len(data), _ROW):
+        chunk = data[offset:offset + _ROW]
+        hex_str = chunk.hex(' ').ljust(_ROW * 3 - 1)
+        ascii_str = chunk.translate(_PRINTABLE).decode('ascii')
+        out.append(f"0x{start_addr + offset:04x}: {hex_str}  |{ascii_str}|\n")
 
-    for addr in range(start_addr, min(end_addr + 1, len(data))):
-        byte = data[addr]
-        print(f"0x{addr:04x}: 0x{byte:02x} ({byte:08b}) '{chr(byte) if 32 <= byte <= 126 else '.'}'")
+    # Emit the whole dump in one write instead of one print per row
+    sys.stdout.write(''.join(out))
 
 if __name__ == '__main__':
     if len(sys.argv) != 4: